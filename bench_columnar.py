@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+
+# ==============================
+# CONFIG
+# ==============================
+ROWS = 100_000
+DESC_BYTES = 4000   # typical description_html size
+
+# Each loader runs in a fresh interpreter so peak RSS is measured in isolation
+LOADERS = {
+    "csv_full": "pandas.read_csv of the whole file (old hotels_ai_enrich behaviour)",
+    "csv_chunked": "columnar.iter_batches over CSV (usecols + chunks)",
+    "arrow_mmap": "columnar.iter_batches over memory-mapped Arrow IPC",
+}
+
+# ==============================
+# DATA
+# ==============================
+def make_catalogue(path_csv: str, rows: int):
+    from columnar import BatchWriter
+
+    rnd = random.Random(42)
+    areas = ["Sliema", "St Julian's", "Valletta", "Mellieha", "Bugibba", "Gozo"]
+    words = "golden stone luzzu harbour sunset terrace balcony baroque sea breeze".split()
+    fields = ["name", "full_address", "location", "stars", "description_html", "url"]
+    out = BatchWriter(path_csv, fields)
+    for start in range(0, rows, 5000):
+        batch = []
+        for i in range(start, min(rows, start + 5000)):
+            body = " ".join(rnd.choice(words) for _ in range(DESC_BYTES // 7))
+            batch.append({
+                "name": f"Hotel {i}",
+                "full_address": f"{i % 200} Triq il-Kbira, {areas[i % 6]}, Malta",
+                "location": areas[i % 6],
+                "stars": str(1 + i % 5),
+                "description_html": f"<h3>Hotel {i}</h3><p>{body}</p>",
+                "url": f"https://www.yellow.com.mt/hotels/hotel-{i}",
+            })
+        out.write(batch)
+    out.close()
+
+# ==============================
+# LOADERS (run in child process)
+# ==============================
+def load(kind: str, path_csv: str) -> dict:
+    from columnar import ENRICH_COLUMNS, arrow_path, iter_batches
+
+    start = time.perf_counter()
+    rows = 0
+    if kind == "csv_full":
+        import pandas as pd
+        df = pd.read_csv(path_csv)
+        for _, row in df.iterrows():
+            _ = (row.get("name"), row.get("location"), row.get("stars"), row.get("full_address"))
+            rows += 1
+    else:
+        path = arrow_path(path_csv) if kind == "arrow_mmap" else path_csv
+        for batch in iter_batches(path, ENRICH_COLUMNS):
+            rows += len(batch)
+    return {
+        "loader": kind,
+        "rows": rows,
+        "seconds": round(time.perf_counter() - start, 3),
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark CSV vs memory-mapped Arrow input for enrichment.")
+    ap.add_argument("--rows", type=int, default=ROWS)
+    ap.add_argument("--child", nargs=2, metavar=("LOADER", "CSV"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(load(*args.child)))
+        return
+
+    from columnar import arrow_path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path_csv = os.path.join(tmp, "catalogue.csv")
+        print(f"🧪 Generating {args.rows:,} rows ...")
+        make_catalogue(path_csv, args.rows)
+        for p in (path_csv, arrow_path(path_csv)):
+            print(f"   {os.path.basename(p)}: {os.path.getsize(p) / 1e6:.0f} MB")
+
+        print(f"\n{'loader':<12} {'rows':>8} {'seconds':>8} {'peak RSS MB':>12}  what")
+        for kind, desc in LOADERS.items():
+            res = subprocess.run([sys.executable, __file__, "--child", kind, path_csv],
+                                 capture_output=True, text=True, check=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+            r = json.loads(res.stdout.strip().splitlines()[-1])
+            print(f"{r['loader']:<12} {r['rows']:>8} {r['seconds']:>8} {r['peak_rss_mb']:>12}  {desc}")
+
+if __name__ == "__main__":
+    main()
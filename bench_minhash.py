@@ -0,0 +1,98 @@
+import time
+import argparse
+import numpy as np
+
+from near_dupes import NearDupIndex, shingles
+
+# ==============================
+# CONFIG
+# ==============================
+SIZES = [1_000, 10_000, 100_000]
+WORDS_PER_DOC = 450     # ~3-4 KB of HTML, like a real description_html
+VOCAB = 6000
+DUP_RATE = 0.01         # share of documents planted as near-copies of an earlier one
+DUP_EDIT = 0.04         # share of words changed in a planted copy
+
+BOILERPLATE = (
+    "<h4>Hotel Features & Atmosphere</h4><h4>Amenities & Services</h4>"
+    "<p><strong>Hotel Facilities</strong></p><p><strong>Room Features</strong></p>"
+    "<h4>Location & Accessibility</h4><p><strong>Within Walking Distance:</strong></p>"
+    "<h4>Guest Experiences</h4><p><strong>What Visitors Love</strong></p>"
+    "<p><strong>Ready to experience Malta?</strong><br>[BOOK NOW - KM Malta Airlines Packages]</p>"
+)
+
+# ==============================
+# DATA
+# ==============================
+def make_corpus(n: int, seed: int = 7) -> tuple[list[str], set[int]]:
+    """Synthetic descriptions plus the indices of the planted near-duplicates."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(VOCAB)])
+    weights = 1.0 / np.arange(1, VOCAB + 1)          # Zipf-like word frequencies
+    weights /= weights.sum()
+    docs, word_ids, planted = [], [], set()
+    for i in range(n):
+        if i > 10 and rng.random() < DUP_RATE:
+            ids = word_ids[rng.integers(0, i)].copy()
+            edits = rng.random(len(ids)) < DUP_EDIT
+            ids[edits] = rng.choice(VOCAB, edits.sum(), p=weights)
+            planted.add(i)
+        else:
+            ids = rng.choice(VOCAB, WORDS_PER_DOC, p=weights)
+        word_ids.append(ids)
+        docs.append(f"<h3>Hotel {i}</h3><p>{' '.join(vocab[ids])}</p>{BOILERPLATE}")
+    return docs, planted
+
+# ==============================
+# BENCHMARKS
+# ==============================
+def bench_lsh(docs: list[str], planted: set[int]) -> dict:
+    index = NearDupIndex()
+    flagged = set()
+    start = time.perf_counter()
+    for i, html in enumerate(docs):
+        if index.check_and_add(str(i), html):
+            flagged.add(i)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "flagged": len(flagged),
+        "recall": len(flagged & planted) / len(planted) if planted else 1.0,
+        "false_pos": len(flagged - planted),
+    }
+
+def bench_pairwise(docs: list[str], limit: int) -> float:
+    """Seconds for exact all-pairs Jaccard over the first `limit` docs."""
+    sets = [set(shingles(d).tolist()) for d in docs[:limit]]
+    start = time.perf_counter()
+    for i in range(len(sets)):
+        a = sets[i]
+        for j in range(i):
+            b = sets[j]
+            _ = len(a & b) / len(a | b)
+    return time.perf_counter() - start
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate detection.")
+    ap.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    ap.add_argument("--pairwise", type=int, default=1000,
+                    help="docs for the exact O(n²) baseline (extrapolated to larger sizes)")
+    args = ap.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    docs, planted = make_corpus(max(sizes))
+    pair_docs = min(args.pairwise, max(sizes))
+    pair_s = bench_pairwise(docs, pair_docs)
+    per_pair = pair_s / (pair_docs * (pair_docs - 1) / 2)
+
+    print(f"{'docs':>8} {'LSH s':>8} {'flagged':>8} {'recall':>7} {'false+':>7} {'pairwise s (est.)':>18}")
+    for n in sizes:
+        r = bench_lsh(docs[:n], {i for i in planted if i < n})
+        est = per_pair * n * (n - 1) / 2
+        print(f"{n:>8} {r['seconds']:>8.2f} {r['flagged']:>8} {r['recall']:>7.1%} {r['false_pos']:>7} {est:>18.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import csv
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# ==============================
+# CONFIG
+# ==============================
+BATCH_SIZE = 1000
+# Columns the enrichment prompt actually needs
+ENRICH_COLUMNS = ["name", "location", "stars", "full_address"]
+
+# ==============================
+# HELPERS
+# ==============================
+def arrow_path(csv_path: str) -> str:
+    """hotels_ai_ready.csv -> hotels_ai_ready.arrow"""
+    return os.path.splitext(csv_path)[0] + ".arrow"
+
+def _clean(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+# ==============================
+# READER
+# ==============================
+def iter_batches(path: str, columns: list[str], batch_size: int = BATCH_SIZE):
+    """
+    Yield lists of row dicts holding only `columns` (missing ones as "").
+
+    An Arrow IPC file (.arrow/.feather) is memory-mapped and read one record
+    batch at a time, so unused columns such as description_html are never
+    loaded. Anything else is read as CSV in chunks with usecols.
+    """
+    if path.endswith((".arrow", ".feather")):
+        with pa.memory_map(path, "r") as source:
+            reader = ipc.open_file(source)
+            present = [c for c in columns if c in reader.schema.names]
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i).select(present)
+                for start in range(0, batch.num_rows, batch_size):
+                    yield _rows(batch.slice(start, batch_size).to_pylist(), columns)
+    else:
+        chunks = pd.read_csv(path, usecols=lambda c: c in columns, dtype=str,
+                             keep_default_na=False, chunksize=batch_size)
+        for chunk in chunks:
+            yield _rows(chunk.to_dict("records"), columns)
+
+def _rows(records: list[dict], columns: list[str]) -> list[dict]:
+    return [{c: _clean(r.get(c)) for c in columns} for r in records]
+
+def input_path(csv_path: str) -> str:
+    """
+    Prefer the Arrow sibling of a CSV input, but only when it is at least as
+    new as the CSV; an older .arrow means the CSV was rewritten without it.
+    """
+    arrow = arrow_path(csv_path)
+    if not os.path.exists(arrow):
+        return csv_path
+    if os.path.exists(csv_path) and os.path.getmtime(arrow) < os.path.getmtime(csv_path):
+        print(f"⚠️ {arrow} is older than {csv_path} — ignoring it and reading the CSV")
+        return csv_path
+    print(f"ℹ️ {arrow} is up to date with {csv_path} — reading the memory-mapped Arrow file")
+    return arrow
+
+# ==============================
+# WRITER
+# ==============================
+class BatchWriter:
+    """
+    Writes the same rows to a CSV and an uncompressed Arrow IPC file
+    (memory-mappable, readable by pyarrow/pandas.read_feather), one batch at
+    a time. All columns are stored as strings, matching the CSV.
+    """
+
+    def __init__(self, csv_path: str, fields: list[str], encoding: str = "utf-8"):
+        self.fields = fields
+        self.csv_fh = open(csv_path, "w", newline="", encoding=encoding)
+        self.csv = csv.DictWriter(self.csv_fh, fieldnames=fields, extrasaction="ignore")
+        self.csv.writeheader()
+        self.schema = pa.schema([(f, pa.string()) for f in fields])
+        self.arrow = ipc.new_file(arrow_path(csv_path), self.schema)
+        self.rows = 0
+
+    def write(self, rows: list[dict]):
+        if not rows:
+            return
+        clean = [{f: _clean(r.get(f)) for f in self.fields} for r in rows]
+        self.csv.writerows(clean)
+        self.arrow.write_batch(pa.RecordBatch.from_pylist(clean, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        self.csv_fh.close()
+        self.arrow.close()
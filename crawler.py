@@ -0,0 +1,270 @@
+import os
+import csv
+import sqlite3
+import argparse
+from bs4 import BeautifulSoup
+
+from hotels_all import BASE, HEADERS, extract_listing_links, parse_detail
+from throttle import AdaptiveThrottle
+from metrics import METRICS
+from shard import add_run_arguments, run_with_metrics
+
+# ==============================
+# CONFIG
+# ==============================
+FRONTIER_DB = "crawl_frontier.sqlite"   # persistent crawl state (pause/resume)
+OUT_DIR = "crawl_output"                # one CSV per category
+MAX_ATTEMPTS = 3                        # give up on a URL after this many failures
+
+# Per-category settings. "path" is the yellow.com.mt listing path,
+# "priority" orders the crawl (lower runs first).
+CATEGORIES = {
+    "hotels":      {"path": "/hotels/",           "max_pages": 20,  "priority": 0},
+    "guesthouses": {"path": "/guest-houses/",     "max_pages": 30,  "priority": 1},
+    "apartments":  {"path": "/apartments/",       "max_pages": 60,  "priority": 2},
+    "restaurants": {"path": "/restaurants/",      "max_pages": 150, "priority": 3},
+}
+
+FIELDS = [
+    "category", "name", "full_address", "location", "area", "stars",
+    "licence_ref", "bedrooms", "apartments", "url",
+]
+
+# ==============================
+# FRONTIER
+# ==============================
+class Frontier:
+    """
+    Deduplicated priority queue of URLs kept in SQLite, so only the item
+    being processed lives in memory and a stopped crawl resumes where it left off.
+
+    Each URL is a "list" page (a category results page) or a "detail" page.
+    Detail pages sort ahead of the next list page of the same category, which
+    keeps the pending set small.
+    """
+
+    def __init__(self, path: str = FRONTIER_DB):
+        self.db = sqlite3.connect(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url       TEXT PRIMARY KEY,
+                kind      TEXT NOT NULL,
+                category  TEXT NOT NULL,
+                page      INTEGER,
+                priority  INTEGER NOT NULL,
+                seq       INTEGER NOT NULL,
+                state     TEXT NOT NULL DEFAULT 'pending',
+                attempts  INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS frontier_next ON frontier (state, priority, seq)"
+        )
+        self.db.commit()
+        # Read the high-water mark once; a MAX(seq) per push would make the frontier O(n²)
+        (self.seq,) = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM frontier").fetchone()
+
+    def _next_seq(self) -> int:
+        self.seq += 1
+        return self.seq
+
+    def push(self, url: str, kind: str, category: str, priority: int, page: int | None = None) -> bool:
+        """Add a URL unless it was ever seen before. Returns True if it was new."""
+        cur = self.db.execute(
+            "INSERT OR IGNORE INTO frontier (url, kind, category, page, priority, seq) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, kind, category, page, priority, self._next_seq()),
+        )
+        return cur.rowcount == 1
+
+    def pop(self, categories: list[str]):
+        """Highest-priority pending item of `categories` as (url, kind, category, page), or None."""
+        marks = ", ".join("?" * len(categories))
+        return self.db.execute(
+            "SELECT url, kind, category, page FROM frontier "
+            f"WHERE state = 'pending' AND category IN ({marks}) ORDER BY priority, seq LIMIT 1",
+            categories,
+        ).fetchone()
+
+    def done(self, url: str):
+        self.db.execute("UPDATE frontier SET state = 'done' WHERE url = ?", (url,))
+        self.db.commit()
+
+    def failed(self, url: str):
+        """Count a failure; requeue at the back of its priority until MAX_ATTEMPTS."""
+        self.db.execute(
+            "UPDATE frontier SET attempts = attempts + 1, seq = ?, "
+            "state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+            "WHERE url = ?",
+            (self._next_seq(), MAX_ATTEMPTS, url),
+        )
+        self.db.commit()
+
+    def reset(self, categories: list[str]):
+        """Forget every URL of `categories` so their next crawl starts from page 1."""
+        marks = ", ".join("?" * len(categories))
+        self.db.execute(f"DELETE FROM frontier WHERE category IN ({marks})", categories)
+        self.db.commit()
+
+    def stats(self) -> list[tuple]:
+        return self.db.execute(
+            "SELECT category, kind, state, COUNT(*) FROM frontier "
+            "GROUP BY category, kind, state ORDER BY category, kind, state"
+        ).fetchall()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+# ==============================
+# CRAWLER
+# ==============================
+def list_url(category: str, page: int) -> str:
+    return f"{BASE}{CATEGORIES[category]['path']}?page={page}"
+
+def seed(frontier: Frontier, categories: list[str]):
+    for cat in categories:
+        frontier.push(list_url(cat, 1), "list", cat, CATEGORIES[cat]["priority"] * 2 + 1, page=1)
+    frontier.db.commit()
+
+def fetch(url: str, throttle: AdaptiveThrottle) -> str:
+    r = throttle.get(url, headers=HEADERS, timeout=30)
+    r.raise_for_status()
+    return r.text
+
+def handle_list(frontier: Frontier, throttle: AdaptiveThrottle, url: str, category: str, page: int):
+    conf = CATEGORIES[category]
+    html = fetch(url, throttle)
+    with METRICS.stage("parse"):
+        links = extract_listing_links(BeautifulSoup(html, "html.parser"))
+    new = sum(frontier.push(u, "detail", category, conf["priority"] * 2) for u in links)
+    METRICS.count("dedup_hits", len(links) - new)
+    print(f"🟡 [{category}] page {page}: {len(links)} links, {new} new")
+
+    # Same stopping rule as hotels_all.main(): keep paging while pages add new links
+    if (new or page == 1) and page < conf["max_pages"]:
+        frontier.push(list_url(category, page + 1), "list", category, conf["priority"] * 2 + 1, page=page + 1)
+
+def handle_detail(throttle: AdaptiveThrottle, writers: dict, url: str, category: str):
+    html = fetch(url, throttle)
+    with METRICS.stage("parse"):
+        row = parse_detail(html, url)
+    row["category"] = category
+    with METRICS.stage("write"):
+        written = writers[category].write(row)
+    if written:
+        METRICS.count("rows_written")
+        print(f"🔎 [{category}] {row['name'] or url}")
+    else:
+        METRICS.count("dedup_hits")
+        print(f"↩️ [{category}] {url} already in output (crawl was stopped mid-item)")
+
+def output_path(category: str) -> str:
+    return os.path.join(OUT_DIR, f"{category}.csv")
+
+class CategoryWriter:
+    """
+    Appends rows to crawl_output/<category>.csv as they arrive.
+
+    A row is flushed before its URL is marked done in the frontier, so a crawl
+    stopped in between would fetch that URL again on resume. The writer
+    therefore remembers the URLs already in the file and skips them.
+    """
+
+    def __init__(self, category: str):
+        os.makedirs(OUT_DIR, exist_ok=True)
+        path = output_path(category)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.urls = set()
+        if not is_new:
+            with open(path, newline="", encoding="utf-8") as fh:
+                self.urls = {r["url"] for r in csv.DictReader(fh)}
+        self.fh = open(path, "a", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.fh, fieldnames=FIELDS, extrasaction="ignore")
+        if is_new:
+            self.writer.writeheader()
+
+    def write(self, row: dict) -> bool:
+        """Append row unless its URL is already in the file. Returns True if written."""
+        if row["url"] in self.urls:
+            return False
+        self.writer.writerow(row)
+        self.fh.flush()
+        self.urls.add(row["url"])
+        return True
+
+    def close(self):
+        self.fh.close()
+
+def crawl(categories: list[str], max_requests: int | None = None):
+    frontier = Frontier()
+    throttle = AdaptiveThrottle()   # one controller paces every category
+    writers = {cat: CategoryWriter(cat) for cat in categories}
+    seed(frontier, categories)
+
+    handled = 0
+    try:
+        while max_requests is None or handled < max_requests:
+            item = frontier.pop(categories)
+            if item is None:
+                print("✅ Frontier empty for the selected categories. Crawl complete.")
+                break
+            url, kind, category, page = item
+            try:
+                if kind == "list":
+                    handle_list(frontier, throttle, url, category, page)
+                else:
+                    handle_detail(throttle, writers, url, category)
+                frontier.done(url)
+            except Exception as e:
+                print(f"   ⚠️ {url}: {e}")
+                frontier.failed(url)
+            handled += 1
+    except KeyboardInterrupt:
+        print("⏸️ Paused. Run again to resume from the saved frontier.")
+    finally:
+        frontier.close()
+        throttle.close()
+        for w in writers.values():
+            w.close()
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    ap = argparse.ArgumentParser(description="Category-aware yellow.com.mt crawler with a resumable frontier.")
+    ap.add_argument("--categories", default=",".join(CATEGORIES),
+                    help=f"comma-separated subset of: {', '.join(CATEGORIES)} "
+                         "(pending URLs of other categories stay queued for a later run)")
+    ap.add_argument("--max-requests", type=int, default=None,
+                    help="stop (pause) after this many requests; rerun to continue")
+    ap.add_argument("--status", action="store_true", help="print frontier counts and exit")
+    ap.add_argument("--reset", action="store_true",
+                    help="forget the saved frontier and output CSVs of the selected categories and start over")
+    add_run_arguments(ap, sharded=False)
+    args = ap.parse_args()
+
+    if args.status:
+        frontier = Frontier()
+        for category, kind, state, n in frontier.stats():
+            print(f"{category:<12} {kind:<6} {state:<8} {n}")
+        frontier.close()
+        return
+
+    categories = [c.strip() for c in args.categories.split(",") if c.strip()]
+    unknown = [c for c in categories if c not in CATEGORIES]
+    if unknown:
+        ap.error(f"unknown categories: {', '.join(unknown)}")
+
+    if args.reset:
+        frontier = Frontier()
+        frontier.reset(categories)
+        frontier.close()
+        for cat in categories:
+            if os.path.exists(output_path(cat)):
+                os.remove(output_path(cat))
+        print(f"🧹 Reset {', '.join(categories)}")
+    run_with_metrics(args, crawl, categories, args.max_requests)
+
+if __name__ == "__main__":
+    main()
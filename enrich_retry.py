@@ -0,0 +1,88 @@
+import time
+import random
+
+from metrics import METRICS
+
+# ==============================
+# CONFIG
+# ==============================
+STATUS_OK = "ok"
+STATUS_RETRYABLE = "retryable"   # transient (rate limit, timeout, 5xx) — worth another go
+STATUS_FAILED = "failed"         # permanent (bad request, auth, empty reply)
+STATUS_DUPLICATE = "duplicate"   # generated fine but near-identical to another hotel's copy
+STATUS_FIELDS = ["enrich_status", "enrich_error", "enrich_attempts"]
+
+RETRY_ROUNDS = 3      # extra passes over retryable rows within one run
+BACKOFF_BASE = 2.0    # seconds; round n waits uniform(0, BACKOFF_BASE * 2**n)
+BACKOFF_MAX = 60.0
+
+RETRYABLE_HTTP = (408, 409, 429, 500, 502, 503, 504)
+# Transient error classes across openai SDK versions (v0.28 and v1.x)
+RETRYABLE_ERRORS = (
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "Timeout", "ServiceUnavailableError", "TryAgain",
+)
+
+# ==============================
+# HELPERS
+# ==============================
+def classify_error(e: Exception) -> str:
+    status = getattr(e, "status_code", None) or getattr(e, "http_status", None)
+    if status in RETRYABLE_HTTP or type(e).__name__ in RETRYABLE_ERRORS:
+        return STATUS_RETRYABLE
+    return STATUS_FAILED
+
+def backoff_delay(round_no: int) -> float:
+    """Full-jitter exponential backoff so concurrent runs don't retry in lockstep."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** round_no))
+
+def needs_retry(row: dict) -> bool:
+    """True for rows a previous run did not enrich successfully (incl. pre-status CSVs)."""
+    status = row.get("enrich_status") or ""
+    if status:
+        return status != STATUS_OK
+    html = row.get("description_html") or ""
+    return not html or html.startswith("Error generating content")
+
+def enrich_row(row: dict, generate):
+    """Fill description_html via generate(row); record the outcome in STATUS_FIELDS."""
+    row["enrich_attempts"] = int(row.get("enrich_attempts") or 0) + 1
+    try:
+        html = generate(row)
+        if not html:
+            raise ValueError("empty response")
+        row["description_html"] = html
+        row["enrich_status"] = STATUS_OK
+        row["enrich_error"] = ""
+    except Exception as e:
+        METRICS.count("enrich_errors")
+        # Never let an error message leak into the published content column
+        row["description_html"] = ""
+        row["enrich_status"] = classify_error(e)
+        row["enrich_error"] = f"{type(e).__name__}: {e}"[:300]
+
+def enrich_rows(rows: list[dict], generate, rounds: int = RETRY_ROUNDS) -> dict:
+    """
+    Enrich every row once, then re-run only the retryable ones for up to
+    `rounds` more passes with jittered backoff. Returns a status -> count map.
+    """
+    for row in rows:
+        enrich_row(row, generate)
+
+    for round_no in range(rounds):
+        pending = [r for r in rows if r["enrich_status"] == STATUS_RETRYABLE]
+        if not pending:
+            break
+        delay = backoff_delay(round_no)
+        print(f"🔁 Retry round {round_no + 1}/{rounds}: {len(pending)} rows after {delay:.1f}s")
+        time.sleep(delay)
+        for row in pending:
+            METRICS.count("enrich_retries")
+            enrich_row(row, generate)
+
+    summary = {}
+    for row in rows:
+        summary[row["enrich_status"]] = summary.get(row["enrich_status"], 0) + 1
+    for status, n in summary.items():
+        METRICS.count(f"enrich_{status}", n)
+    return summary
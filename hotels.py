@@ -1,10 +1,10 @@
-import requests
 import pandas as pd
-import time
 from bs4 import BeautifulSoup
 import openai
 import os
 
+from throttle import AdaptiveThrottle
+
 # ==========================
 # CONFIGURATION
 # ==========================
@@ -12,6 +12,7 @@ import os
 BASE_URL = "https://www.yellow.com.mt/hotels/?page={}"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 openai.api_key = os.getenv("OPENAI_API_KEY")
+THROTTLE = AdaptiveThrottle()  # adapts request rate to the site instead of fixed sleeps
 
 # ==========================
 # SCRAPER FUNCTION
@@ -25,7 +26,7 @@ def scrape_hotels():
         url = BASE_URL.format(page)
         print(f"🟡 Scraping page {page}: {url}")
 
-        res = requests.get(url, headers=HEADERS)
+        res = THROTTLE.get(url, headers=HEADERS)
         soup = BeautifulSoup(res.text, "html.parser")
 
         cards = soup.select("a.business-name, div.business-card a, h2 a, .business-listing a")
@@ -43,7 +44,7 @@ def scrape_hotels():
             hotel_page = f"https://www.yellow.com.mt{link}"
             print(f"🏨 Scraping details for: {name}")
 
-            hotel_res = requests.get(hotel_page, headers=HEADERS)
+            hotel_res = THROTTLE.get(hotel_page, headers=HEADERS)
             hotel_soup = BeautifulSoup(hotel_res.text, "html.parser")
 
             address = hotel_soup.select_one(".address")
@@ -107,11 +108,7 @@ Follow this structure:
                 "description_html": ai_description
             })
 
-            # Delay between hotels to avoid blocking
-            time.sleep(2)
-
         page += 1
-        time.sleep(3)
 
     # ==========================
     # EXPORT RESULTS
@@ -124,4 +121,7 @@ Follow this structure:
 # RUN SCRIPT
 # ==========================
 if __name__ == "__main__":
-    scrape_hotels()
+    try:
+        scrape_hotels()
+    finally:
+        THROTTLE.close()
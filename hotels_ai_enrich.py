@@ -1,12 +1,23 @@
 import os
-import pandas as pd
+import argparse
+from collections import Counter
 from openai import OpenAI
 
+from metrics import METRICS
+from enrich_retry import (
+    STATUS_FIELDS, STATUS_OK, STATUS_RETRYABLE, STATUS_FAILED, STATUS_DUPLICATE,
+    enrich_rows, needs_retry,
+)
+from columnar import ENRICH_COLUMNS, BatchWriter, arrow_path, input_path, iter_batches
+from shard import in_shard, shard_path, add_run_arguments, run_with_metrics
+from hotels_all import norm_url
+from near_dupes import DUPLICATE_HINT, NearDupIndex, dedupe_rows, index_path, load_index
+
 # ================================
 # CONFIGURATION
 # ================================
-INPUT_CSV = "hotels_all_output.csv"      # your scraped source
-OUTPUT_CSV = "hotels_ai_ready.csv"       # enriched AI output
+INPUT_CSV = "hotels_all_output.csv"      # your scraped source (a sibling .arrow is preferred)
+OUTPUT_CSV = "hotels_ai_ready.csv"       # enriched AI output (+ hotels_ai_ready.arrow)
 MODEL = "gpt-4o-mini"
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
@@ -45,51 +56,117 @@ HTML TEMPLATE:
 """
 
 # ================================
-# MAIN ENRICHMENT FUNCTION
+# GENERATION
 # ================================
-def enrich_hotels():
-    df = pd.read_csv(INPUT_CSV)
-    enriched_rows = []
-
-    for _, row in df.iterrows():
-        name = row.get("name", "")
-        location = row.get("location", "")
-        stars = row.get("stars", "")
-        address = row.get("full_address", "")
-
-        prompt = f"""
-Hotel Name: {name}
-Location: {location}
-Stars: {stars}
-Address: {address}
+OUTPUT_FIELDS = ["name", "full_address", "location", "stars", "description_html", "url"] + STATUS_FIELDS + ["duplicate_of"]
+# url is carried through so sharded runs can be partitioned and merged on it
+INPUT_COLUMNS = ENRICH_COLUMNS + ["url"]
+
+def generate_description(row: dict) -> str:
+    """One OpenAI call for one hotel. Raises on any API error."""
+    prompt = f"""
+Hotel Name: {row["name"]}
+Location: {row["location"]}
+Stars: {row["stars"]}
+Address: {row["full_address"]}
 
 {PROMPT_TEMPLATE}
         """
+    if row.get("enrich_status") == STATUS_DUPLICATE:
+        prompt += DUPLICATE_HINT
+
+    with METRICS.stage("enrich"):
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": "You are a professional Malta hotel copywriter."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.8,
+            max_tokens=1500
+        )
+    if response.usage:
+        METRICS.count("openai_tokens", response.usage.total_tokens)
+    return (response.choices[0].message.content or "").strip()
+
+def report(summary: dict, total: int, out_csv: str):
+    counts = ", ".join(f"{n} {status}" for status, n in sorted(summary.items()))
+    print(f"✅ AI enrichment complete: {total} hotels saved to {out_csv} + {arrow_path(out_csv)} ({counts})")
+    if summary.get(STATUS_RETRYABLE) or summary.get(STATUS_FAILED) or summary.get(STATUS_DUPLICATE):
+        print("   ↪ re-run only the unsuccessful rows with: python hotels_ai_enrich.py retry-failed")
 
-        try:
-            response = client.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a professional Malta hotel copywriter."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                max_tokens=1500
-            )
-            html_description = response.choices[0].message.content.strip()
-        except Exception as e:
-            html_description = f"Error generating content: {e}"
-
-        enriched_rows.append({
-            "name": name,
-            "full_address": address,
-            "location": location,
-            "stars": stars,
-            "description_html": html_description
-        })
-
-    pd.DataFrame(enriched_rows).to_csv(OUTPUT_CSV, index=False, encoding="utf-8-sig")
-    print(f"✅ AI enrichment complete: {len(enriched_rows)} hotels saved to {OUTPUT_CSV}")
+# ================================
+# MAIN ENRICHMENT FUNCTION
+# ================================
+def enrich_hotels(shard=None, out_csv=OUTPUT_CSV):
+    # Stream the input a batch at a time: only INPUT_COLUMNS are materialised,
+    # and enriched batches go straight to CSV + Arrow instead of piling up.
+    source = input_path(INPUT_CSV)
+    print(f"📥 Reading {source}" + (f" (shard {shard[0]}/{shard[1]})" if shard else ""))
+    out = BatchWriter(out_csv, OUTPUT_FIELDS, encoding="utf-8-sig")
+    index = NearDupIndex()
+    summary = Counter()
+    try:
+        for batch in iter_batches(source, INPUT_COLUMNS):
+            if shard:
+                batch = [r for r in batch if in_shard(norm_url(r["url"]) or r["name"], shard)]
+            enrich_rows(batch, generate_description)
+            dedupe_rows(batch, index, generate_description)
+            summary.update(r["enrich_status"] for r in batch)
+            with METRICS.stage("write"):
+                out.write(batch)
+            METRICS.count("rows_written", len(batch))
+    finally:
+        out.close()
+        index.save(index_path(out_csv))
+    report(summary, out.rows, out_csv)
+
+def retry_failed(out_csv=OUTPUT_CSV):
+    """Re-enrich only rows of the previous output that did not finish 'ok'."""
+    source = input_path(out_csv)
+    if not os.path.exists(source):
+        print(f"❌ {out_csv} not found — run a full enrichment first.")
+        return
+    index = load_index(out_csv, (r for batch in iter_batches(source, OUTPUT_FIELDS) for r in batch))
+    tmp_csv = os.path.splitext(out_csv)[0] + ".retry.csv"
+    out = BatchWriter(tmp_csv, OUTPUT_FIELDS, encoding="utf-8-sig")
+    summary = Counter()
+    retried = 0
+    try:
+        for batch in iter_batches(source, OUTPUT_FIELDS):
+            todo = [r for r in batch if needs_retry(r)]
+            for r in batch:
+                # Outputs written before enrich_status existed: mark good rows explicitly
+                if not r["enrich_status"] and not needs_retry(r):
+                    r["enrich_status"] = STATUS_OK
+            if todo:
+                enrich_rows(todo, generate_description)
+                dedupe_rows(todo, index, generate_description)
+                retried += len(todo)
+            summary.update(r["enrich_status"] for r in batch)
+            with METRICS.stage("write"):
+                out.write(batch)
+    finally:
+        out.close()
+        index.save(index_path(out_csv))
+
+    print(f"🔁 Re-enriched {retried} of {out.rows} rows")
+    os.replace(tmp_csv, out_csv)
+    os.replace(arrow_path(tmp_csv), arrow_path(out_csv))
+    METRICS.count("rows_written", out.rows)
+    report(summary, out.rows, out_csv)
+
+def main():
+    ap = argparse.ArgumentParser(description="AI-enrich scraped hotels into description_html.")
+    add_run_arguments(ap, default_mode="enrich")
+    args = ap.parse_args()
+
+    out_csv = shard_path(OUTPUT_CSV, args.shard)
+    if args.mode == "retry-failed":
+        run, run_args = retry_failed, (out_csv,)
+    else:
+        run, run_args = enrich_hotels, (args.shard, out_csv)
+    run_with_metrics(args, run, *run_args)
 
 if __name__ == "__main__":
-    enrich_hotels()
+    main()
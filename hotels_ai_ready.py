@@ -1,7 +1,7 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
+
+from throttle import AdaptiveThrottle
 
 # ---------------- CONFIG ---------------- #
 BASE = "https://www.yellow.com.mt"
@@ -10,7 +10,7 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126 Safari/537.36"
 }
 MAX_PAGES = 6  # enough to cover ~90 hotels
-SLEEP_BETWEEN = 1.2  # seconds delay per page to be polite
+THROTTLE = AdaptiveThrottle()  # polite, adaptive request pacing
 
 OUT_CSV = "hotels_ai_ready.csv"
 
@@ -20,7 +20,7 @@ def scrape_hotels():
     for page in range(1, MAX_PAGES + 1):
         url = f"{LIST_URL}{page}"
         print(f"Scraping page {page} -> {url}")
-        resp = requests.get(url, headers=HEADERS)
+        resp = THROTTLE.get(url, headers=HEADERS)
 
         if resp.status_code != 200:
             print(f"⚠️ Failed to load page {page}: {resp.status_code}")
@@ -52,7 +52,6 @@ def scrape_hotels():
             })
 
         print(f"✅ Page {page}: found {len(cards)} hotels")
-        time.sleep(SLEEP_BETWEEN)
 
     # save to CSV
     df = pd.DataFrame(all_hotels)
@@ -64,7 +63,7 @@ def scrape_hotels():
 def scrape_hotel_details(url):
     info = {}
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=20)
+        resp = THROTTLE.get(url, headers=HEADERS, timeout=20)
         if resp.status_code != 200:
             return info
 
@@ -91,5 +90,8 @@ def scrape_hotel_details(url):
 # ---------------- MAIN ---------------- #
 if __name__ == "__main__":
     print("🚀 Starting full Malta Hotels scrape...")
-    scrape_hotels()
+    try:
+        scrape_hotels()
+    finally:
+        THROTTLE.close()
     print("✅ Done.")
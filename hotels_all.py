@@ -1,25 +1,33 @@
 import os
 import re
-import time
 import json
+import argparse
+from collections import Counter
 from urllib.parse import urljoin, urlparse
-import requests
 import pandas as pd
 from bs4 import BeautifulSoup
 import openai
 
+from throttle import AdaptiveThrottle
+from metrics import METRICS
+from enrich_retry import STATUS_FIELDS, STATUS_DUPLICATE, enrich_rows, needs_retry
+from columnar import BatchWriter, arrow_path
+from shard import in_shard, shard_path, add_run_arguments, run_with_metrics
+from near_dupes import DUPLICATE_HINT, NearDupIndex, dedupe_rows, index_path, load_index
+
 # ==============================
 # CONFIG
 # ==============================
-BASE = "https://www.yellow.com.mt"
+BASE = os.getenv("YELLOW_BASE", "https://www.yellow.com.mt")  # override to use mock_server.py
 LIST_URL = BASE + "/hotels/?page={}"
 HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126 Safari/537.36"}
 OUT_CSV = "hotels_enriched.csv"
 
-SLEEP_LIST = 0.5
-SLEEP_DETAIL = 0.8
 MAX_PAGES = 20
 
+# Request pacing adapts to the site's latency/errors (see throttle.py)
+THROTTLE = AdaptiveThrottle()
+
 # ——— GPT (v0.28.1 syntax) ———
 openai.api_key = os.getenv("OPENAI_API_KEY", "")
 USE_GPT = bool(openai.api_key) and True  # set False to skip enrichment
@@ -121,7 +129,7 @@ def norm_url(href: str) -> str:
 def is_internal_yellow(href: str) -> bool:
     try:
         u = urlparse(norm_url(href))
-        return u.netloc.endswith("yellow.com.mt")
+        return u.netloc.endswith("yellow.com.mt") or u.netloc == urlparse(BASE).netloc
     except Exception:
         return False
 
@@ -184,10 +192,13 @@ def text_of(el):
     return re.sub(r"\s+", " ", el.get_text(" ", strip=True)) if el else ""
 
 def scrape_detail(url: str) -> dict:
-    time.sleep(SLEEP_DETAIL)
-    r = requests.get(url, headers=HEADERS, timeout=30)
+    r = THROTTLE.get(url, headers=HEADERS, timeout=30)
     r.raise_for_status()
-    s = BeautifulSoup(r.text, "html.parser")
+    with METRICS.stage("parse"):
+        return parse_detail(r.text, url)
+
+def parse_detail(html: str, url: str) -> dict:
+    s = BeautifulSoup(html, "html.parser")
 
     name = text_of(s.select_one("h1")) or text_of(s.select_one("h2"))
     # Try common address blocks
@@ -226,6 +237,7 @@ def scrape_detail(url: str) -> dict:
     return data
 
 def enrich_with_gpt(row: dict) -> str:
+    """Generate description_html for one row. API errors propagate to enrich_rows()."""
     # Build the minimal facts block we actually have
     facts = {
         "name": row.get("name", ""),
@@ -243,8 +255,10 @@ def enrich_with_gpt(row: dict) -> str:
         "and do NOT invent amenities or numbers.\n\n"
         f"FACTS (JSON): {json.dumps(facts, ensure_ascii=False)}"
     )
+    if row.get("enrich_status") == STATUS_DUPLICATE:
+        user_msg += DUPLICATE_HINT
 
-    try:
+    with METRICS.stage("enrich"):
         resp = openai.ChatCompletion.create(
             model="gpt-3.5-turbo",
             messages=[
@@ -253,14 +267,13 @@ def enrich_with_gpt(row: dict) -> str:
             ],
             temperature=0.7,
         )
-        return resp["choices"][0]["message"]["content"].strip()
-    except Exception as e:
-        return ""
+    METRICS.count("openai_tokens", resp.get("usage", {}).get("total_tokens", 0))
+    return resp["choices"][0]["message"]["content"].strip()
 
 # ==============================
 # MAIN
 # ==============================
-def main():
+def run(shard=None, out_csv=OUT_CSV):
     all_links = []
     seen = set()
     page = 1
@@ -268,14 +281,16 @@ def main():
     while page <= MAX_PAGES:
         url = LIST_URL.format(page)
         print(f"🟡 Page {page}: {url}")
-        res = requests.get(url, headers=HEADERS, timeout=30)
+        res = THROTTLE.get(url, headers=HEADERS, timeout=30)
         if res.status_code >= 400:
             print(f"❌ Failed page {page} ({res.status_code}). Stopping.")
             break
-        soup = BeautifulSoup(res.text, "html.parser")
-        page_links = extract_listing_links(soup)
+        with METRICS.stage("parse"):
+            soup = BeautifulSoup(res.text, "html.parser")
+            page_links = extract_listing_links(soup)
         # Filter out ones we've already seen
         new_links = [u for u in page_links if u not in seen]
+        METRICS.count("dedup_hits", len(page_links) - len(new_links))
 
         print(f"   • found {len(page_links)} candidate links, {len(new_links)} new after filtering.")
         for i, u in enumerate(new_links, 1):
@@ -291,30 +306,77 @@ def main():
             all_links.append(u)
 
         page += 1
-        time.sleep(SLEEP_LIST)
 
     if not all_links:
         print("❌ No hotel links found. Check selectors.")
         return
 
+    if shard:
+        # Every shard walks the (cheap) listing pages, then keeps only its slice
+        total = len(all_links)
+        all_links = [u for u in all_links if in_shard(u, shard)]
+        print(f"🧩 Shard {shard[0]}/{shard[1]}: {len(all_links)} of {total} hotels")
+
     rows = []
     for idx, link in enumerate(all_links, 1):
         print(f"🔎 [{idx}/{len(all_links)}] {link}")
         try:
-            row = scrape_detail(link)
-            if USE_GPT:
-                row["description_html"] = enrich_with_gpt(row)
-            else:
-                row["description_html"] = ""
-            rows.append(row)
+            rows.append(scrape_detail(link))
         except Exception as e:
             print(f"   ⚠️ Skipped {link}: {e}")
 
-    df = pd.DataFrame(rows, columns=[
+    if USE_GPT:
+        enrich_rows(rows, enrich_with_gpt)
+        index = NearDupIndex()
+        dedupe_rows(rows, index, enrich_with_gpt)
+        index.save(index_path(out_csv))
+        print(f"🤖 Enrichment: {dict(Counter(r['enrich_status'] for r in rows))}")
+    write_rows(rows, out_csv)
+
+def retry_failed(out_csv=OUT_CSV):
+    """Re-enrich only the rows of the previous output that did not finish 'ok'."""
+    if not USE_GPT:
+        print("⏭️ OPENAI_API_KEY not set (or USE_GPT disabled) — nothing to retry.")
+        return
+    if not os.path.exists(out_csv):
+        print(f"❌ {out_csv} not found — run a full scrape first.")
+        return
+    rows = pd.read_csv(out_csv, dtype=str, keep_default_na=False).to_dict("records")
+    todo = [r for r in rows if needs_retry(r)]
+    print(f"🔁 {len(todo)} of {len(rows)} rows need re-enrichment")
+    if todo:
+        index = load_index(out_csv, rows)
+        enrich_rows(todo, enrich_with_gpt)
+        dedupe_rows(todo, index, enrich_with_gpt)
+        index.save(index_path(out_csv))
+        print(f"🤖 Enrichment: {dict(Counter(r['enrich_status'] for r in todo))}")
+        write_rows(rows, out_csv)
+
+def write_rows(rows: list[dict], out_csv=OUT_CSV):
+    out = BatchWriter(out_csv, [
         "name","full_address","location","area","stars","licence_ref","bedrooms","apartments","description_html","url"
-    ])
-    df.to_csv(OUT_CSV, index=False, encoding="utf-8")
-    print(f"✅ Wrote {len(df)} rows to {OUT_CSV}")
+    ] + STATUS_FIELDS + ["duplicate_of"])
+    with METRICS.stage("write"):
+        out.write(rows)
+        out.close()
+    METRICS.count("rows_written", out.rows)
+    print(f"✅ Wrote {out.rows} rows to {out_csv} and {arrow_path(out_csv)}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Scrape and enrich all Malta hotels.")
+    add_run_arguments(ap, default_mode="scrape")
+    args = ap.parse_args()
+
+    out_csv = shard_path(OUT_CSV, args.shard)
+    THROTTLE.log_path = shard_path(THROTTLE.log_path, args.shard)
+    if args.mode == "retry-failed":
+        fn, fn_args = retry_failed, (out_csv,)
+    else:
+        fn, fn_args = run, (args.shard, out_csv)
+    try:
+        run_with_metrics(args, fn, *fn_args)
+    finally:
+        THROTTLE.close()
 
 if __name__ == "__main__":
     main()
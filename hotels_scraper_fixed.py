@@ -1,7 +1,7 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
+
+from throttle import AdaptiveThrottle
 
 # --------------------------------------------
 # CONFIGURATION
@@ -19,8 +19,7 @@ OUT_CSV = "hotels_scraped.csv"
 
 # Set this high to get ALL hotels
 MAX_PAGES = 1000      # ← was 10, now 1000 to ensure full scrape
-SLEEP_BETWEEN = 1.5   # seconds between page requests
-SLEEP_DETAIL = 0.5    # seconds between hotel detail requests
+THROTTLE = AdaptiveThrottle()  # request pacing adapts to site latency/429s
 
 
 # --------------------------------------------
@@ -32,7 +31,7 @@ def scrape_hotels():
     for page in range(1, MAX_PAGES + 1):
         url = f"{LIST_URL}{page}"
         print(f"🏨 Scraping page {page} → {url}")
-        resp = requests.get(url, headers=HEADERS)
+        resp = THROTTLE.get(url, headers=HEADERS)
 
         if resp.status_code != 200:
             print(f"⚠️ Page {page} returned {resp.status_code}, stopping.")
@@ -53,7 +52,7 @@ def scrape_hotels():
                 link = BASE + link
 
             try:
-                detail_resp = requests.get(link, headers=HEADERS)
+                detail_resp = THROTTLE.get(link, headers=HEADERS)
                 detail_soup = BeautifulSoup(detail_resp.text, "html.parser")
 
                 name_tag = detail_soup.select_one("h1")
@@ -82,10 +81,6 @@ def scrape_hotels():
                 print(f"❌ Error scraping {link}: {e}")
                 continue
 
-            time.sleep(SLEEP_DETAIL)
-
-        time.sleep(SLEEP_BETWEEN)
-
     # --------------------------------------------
     # SAVE RESULTS
     # --------------------------------------------
@@ -98,4 +93,7 @@ def scrape_hotels():
 # ENTRY POINT
 # --------------------------------------------
 if __name__ == "__main__":
-    scrape_hotels()
+    try:
+        scrape_hotels()
+    finally:
+        THROTTLE.close()
@@ -1,14 +1,15 @@
-import requests
 import pandas as pd
-import time
 from bs4 import BeautifulSoup
 import openai
 import os
 
+from throttle import AdaptiveThrottle
+
 # ============ CONFIG ============
 BASE_URL = "https://www.yellow.com.mt/hotels/?page={}"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 openai.api_key = os.getenv("OPENAI_API_KEY")
+THROTTLE = AdaptiveThrottle()
 
 # ============ SCRAPER ============
 def scrape_hotels(limit=5):
@@ -18,7 +19,7 @@ def scrape_hotels(limit=5):
     while len(hotels) < limit:
         url = BASE_URL.format(page)
         print(f"🟡 Scraping page {page}: {url}")
-        res = requests.get(url, headers=HEADERS)
+        res = THROTTLE.get(url, headers=HEADERS)
         soup = BeautifulSoup(res.text, "html.parser")
 
         cards = soup.select("a.business-name, div.business-card a, h2 a, .business-listing a")
@@ -38,7 +39,7 @@ def scrape_hotels(limit=5):
             hotel_page = f"https://www.yellow.com.mt{link}"
             print(f"🏨 Scraping: {name}")
 
-            hotel_res = requests.get(hotel_page, headers=HEADERS)
+            hotel_res = THROTTLE.get(hotel_page, headers=HEADERS)
             hotel_soup = BeautifulSoup(hotel_res.text, "html.parser")
             address = hotel_soup.select_one(".address")
             address_text = address.get_text(strip=True) if address else "Address not found"
@@ -62,10 +63,8 @@ def scrape_hotels(limit=5):
                 "description_html": ai_description,
                 "url": hotel_page
             })
-            time.sleep(2)
 
         page += 1
-        time.sleep(3)
 
     df = pd.DataFrame(hotels)
     df.to_csv("hotels_test_output.csv", index=False, encoding="utf-8")
@@ -73,4 +72,7 @@ def scrape_hotels(limit=5):
 
 # ============ RUN ============
 if __name__ == "__main__":
-    scrape_hotels(limit=5)
+    try:
+        scrape_hotels(limit=5)
+    finally:
+        THROTTLE.close()
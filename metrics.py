@@ -0,0 +1,159 @@
+import io
+import json
+import time
+import pstats
+import cProfile
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# ==============================
+# CONFIG
+# ==============================
+RUN_REPORT = "run_report.json"
+PROMETHEUS_OUT = "run_metrics.prom"
+PROFILE_OUT = "profile.txt"
+PROFILE_TOP = 30
+
+# Latency histogram upper bounds in seconds (Prometheus-style, +Inf implied)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# ==============================
+# METRICS
+# ==============================
+class Histogram:
+    """Fixed-bucket latency histogram; memory does not grow with the run."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS + (self.max,), self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_s": round(self.sum, 4),
+            "mean_s": round(self.sum / self.count, 4) if self.count else None,
+            "min_s": self.min,
+            "max_s": self.max,
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "buckets": {str(b): n for b, n in zip(BUCKETS + ("+Inf",), self.counts)},
+        }
+
+class Metrics:
+    """
+    Per-stage latency histograms plus plain counters for one run.
+
+    Stages used across the scripts: fetch, parse, enrich, write.
+    Counters: requests, bytes, OpenAI tokens, cache (dedup) hits; labelled
+    counters such as HTTP responses by status.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages = {}
+        self.counters = {}
+        self.labelled = {}   # (name, label) -> {label value: count}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name: str, seconds: float):
+        self.stages.setdefault(name, Histogram()).observe(seconds)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def count_by(self, name: str, label: str, value, n: int = 1):
+        """Counter with one label, e.g. count_by("http_responses", "status", 200)."""
+        values = self.labelled.setdefault((name, label), {})
+        values[str(value)] = values.get(str(value), 0) + n
+
+    def report(self) -> dict:
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            "wall_s": round(time.time() - self.started, 3),
+            "stages": {name: h.as_dict() for name, h in sorted(self.stages.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "labelled_counters": {
+                f"{name}_by_{label}": dict(sorted(values.items()))
+                for (name, label), values in sorted(self.labelled.items())
+            },
+        }
+
+    def prometheus(self) -> str:
+        metric = "scraper_stage_seconds"
+        lines = []
+        if self.stages:
+            lines.append(f"# HELP {metric} Latency of each pipeline stage (fetch, parse, enrich, write).")
+            lines.append(f"# TYPE {metric} histogram")
+        for name, h in sorted(self.stages.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS + ("+Inf",), h.counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {h.sum:.6f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {h.count}')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# HELP scraper_{name}_total Total {name.replace('_', ' ')}.")
+            lines.append(f"# TYPE scraper_{name}_total counter")
+            lines.append(f"scraper_{name}_total {value}")
+        for (name, label), values in sorted(self.labelled.items()):
+            lines.append(f"# HELP scraper_{name}_total Total {name.replace('_', ' ')} by {label}.")
+            lines.append(f"# TYPE scraper_{name}_total counter")
+            for value, n in sorted(values.items()):
+                lines.append(f'scraper_{name}_total{{{label}="{value}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str = RUN_REPORT, prometheus_path: str | None = None):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(), fh, indent=2)
+        if prometheus_path:
+            with open(prometheus_path, "w", encoding="utf-8") as fh:
+                fh.write(self.prometheus())
+        print(f"📊 Run report written to {path}" + (f" and {prometheus_path}" if prometheus_path else ""))
+
+# Shared by every module of a run
+METRICS = Metrics()
+
+# ==============================
+# PROFILING
+# ==============================
+def run_profiled(fn, *args, top: int = PROFILE_TOP, out: str = PROFILE_OUT, **kwargs):
+    """Run fn under cProfile and print/save the top-N functions by cumulative time."""
+    prof = cProfile.Profile()
+    try:
+        return prof.runcall(fn, *args, **kwargs)
+    finally:
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+        with open(out, "w", encoding="utf-8") as fh:
+            fh.write(buf.getvalue())
+        print(buf.getvalue())
+        print(f"🔬 Profile (top {top}) written to {out}")
@@ -0,0 +1,135 @@
+import re
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# ==============================
+# CONFIG
+# ==============================
+# Local stand-in for yellow.com.mt, for trying the scrapers without touching
+# the real site. Point hotels_all.py / crawler.py at it with:
+#   YELLOW_BASE=http://127.0.0.1:8765 python crawler.py --categories hotels
+PORT = 8765
+PAGES = 5           # listing pages per category
+PER_PAGE = 15       # cards per listing page
+LATENCY = 0.05      # seconds added to every response
+RATE_LIMIT = 0.0    # server-side limit in req/s (0 = unlimited); excess gets 429 + Retry-After
+
+AREAS = ["Sliema", "St Julian's", "Valletta", "Mellieha", "Bugibba", "Gozo"]
+
+# ==============================
+# SERVER-SIDE RATE LIMIT
+# ==============================
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = 2.0):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+# ==============================
+# PAGES
+# ==============================
+def listing_html(category: str, page: int) -> str:
+    if page > PAGES:
+        return "<html><body><p>No results</p></body></html>"
+    cards = []
+    for i in range(PER_PAGE):
+        slug = f"{category}-{page}-{i}"
+        cards.append(
+            f"<div data-testid='business-list-card'>"
+            f"<a href='/{category}/{slug}/'>{slug.replace('-', ' ').title()}</a>"
+            f"<a href='https://www.booking.com/{slug}'>Book</a>"
+            f"</div>"
+        )
+    return f"<html><body>{''.join(cards)}</body></html>"
+
+def detail_html(category: str, slug: str) -> str:
+    rnd = random.Random(slug)
+    area = rnd.choice(AREAS)
+    stars = rnd.randint(2, 5)
+    name = slug.replace("-", " ").title()
+    return (
+        f"<html><body>"
+        f"<nav class='breadcrumb'><a href='/'>Malta</a><a href='/{category}/'>{area}</a></nav>"
+        f"<h1>{name}</h1>"
+        f"<address>{rnd.randint(1, 200)} Triq il-Kbira, {area}, Malta</address>"
+        f"<span>{stars} star {category[:-1]}</span>"
+        f"</body></html>"
+    )
+
+class Handler(BaseHTTPRequestHandler):
+    bucket = None
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        if self.bucket and not self.bucket.take():
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.end_headers()
+            return
+
+        u = urlparse(self.path)
+        parts = [p for p in u.path.split("/") if p]
+        if len(parts) == 1:
+            page = int(parse_qs(u.query).get("page", ["1"])[0])
+            body = listing_html(parts[0], page)
+        elif len(parts) == 2 and re.fullmatch(r"[\w-]+", parts[1]):
+            body = detail_html(parts[0], parts[1])
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        pass
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    global PAGES, PER_PAGE, LATENCY
+    ap = argparse.ArgumentParser(description="Mock yellow.com.mt listing/detail server.")
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--pages", type=int, default=PAGES)
+    ap.add_argument("--per-page", type=int, default=PER_PAGE)
+    ap.add_argument("--latency", type=float, default=LATENCY)
+    ap.add_argument("--rate-limit", type=float, default=RATE_LIMIT,
+                    help="max requests/second before answering 429 (0 = unlimited)")
+    args = ap.parse_args()
+
+    PAGES, PER_PAGE, LATENCY = args.pages, args.per_page, args.latency
+    if args.rate_limit > 0:
+        Handler.bucket = TokenBucket(args.rate_limit)
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    print(f"🧪 Mock yellow.com.mt on http://127.0.0.1:{args.port} "
+          f"({PAGES} pages x {PER_PAGE} per category, rate limit {args.rate_limit or 'off'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import os
+import re
+import zlib
+import numpy as np
+
+from metrics import METRICS
+from enrich_retry import STATUS_OK, STATUS_DUPLICATE, enrich_rows, needs_retry
+
+# ==============================
+# CONFIG
+# ==============================
+NUM_PERM = 144      # MinHash signature length
+BANDS = 24          # LSH bands of 6 rows: a pair at Jaccard 0.7 becomes a candidate ~95% of
+                    # the time, one at 0.2 (shared HTML boilerplate) only ~0.15%
+THRESHOLD = 0.7     # estimated Jaccard at/above which two descriptions are near-duplicates
+SHINGLE = 3         # words per shingle
+SEED = 1            # fixed so signatures stored on disk stay comparable across runs
+DUP_REGEN_ROUNDS = 2  # regenerations for a near-duplicate description
+
+# Appended to the prompt when a row is regenerated because of a near-duplicate
+DUPLICATE_HINT = (
+    "\nA previous draft was too similar to another hotel's description. "
+    "Use a different tagline, different imagery and different sentence structure.\n"
+)
+
+_TAGS = re.compile(r"<[^>]+>")
+_WORDS = re.compile(r"[a-z0-9']+")
+
+# ==============================
+# HELPERS
+# ==============================
+def index_path(csv_path: str) -> str:
+    """hotels_ai_ready.csv -> hotels_ai_ready.minhash.npz"""
+    return os.path.splitext(csv_path)[0] + ".minhash.npz"
+
+def shingles(html: str) -> np.ndarray:
+    """uint64 hashes of the word SHINGLE-grams of the visible text."""
+    words = _WORDS.findall(_TAGS.sub(" ", html or "").lower())
+    if not words:
+        return np.zeros(1, dtype=np.uint64)
+    # crc32, not hash(): Python's str hash is salted per process
+    h = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+    if len(h) < SHINGLE:
+        return h
+    out = h[: len(h) - SHINGLE + 1].copy()
+    with np.errstate(over="ignore"):
+        for k in range(1, SHINGLE):
+            out = out * np.uint64(0x100000001B3) + h[k: len(h) - SHINGLE + 1 + k]
+    return out
+
+# ==============================
+# INDEX
+# ==============================
+class NearDupIndex:
+    """
+    MinHash signatures with LSH banding. Lookups touch only the descriptions
+    that share at least one band with the query; those are confirmed by signature
+    agreement (an estimate of Jaccard similarity). Total cost is close to linear
+    in the catalogue size, not O(n²).
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        rnd = np.random.default_rng(SEED)
+        # Multiply-shift hash family: odd 64-bit multipliers, random offsets
+        self.a = rnd.integers(1, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rnd.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.keys = []
+        self.sigs = []
+        self.buckets = [{} for _ in range(bands)]
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def signature(self, html: str) -> np.ndarray:
+        h = shingles(html)
+        with np.errstate(over="ignore"):
+            mixed = h[:, None] * self.a[None, :] + self.b[None, :]
+        return (mixed.min(axis=0) >> np.uint64(32)).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, sig: np.ndarray, exclude=None) -> tuple[str, float] | None:
+        """Most similar indexed key with estimated Jaccard >= threshold, or None."""
+        candidates = set()
+        for band, bkey in self._band_keys(sig):
+            candidates.update(self.buckets[band].get(bkey, ()))
+        best = None
+        for pos in candidates:
+            if self.keys[pos] == exclude:
+                continue
+            score = float(np.mean(self.sigs[pos] == sig))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (self.keys[pos], score)
+        return best
+
+    def add(self, key: str, sig: np.ndarray):
+        if key in self.positions:
+            self.remove(key)
+        pos = len(self.keys)
+        self.keys.append(key)
+        self.sigs.append(sig)
+        self.positions[key] = pos
+        for band, bkey in self._band_keys(sig):
+            self.buckets[band].setdefault(bkey, []).append(pos)
+
+    def remove(self, key: str):
+        """Drop key from the buckets (its slot stays, so positions remain valid)."""
+        pos = self.positions.pop(key)
+        for band, bkey in self._band_keys(self.sigs[pos]):
+            self.buckets[band][bkey].remove(pos)
+        self.keys[pos] = None
+
+    def check_and_add(self, key: str, html: str) -> tuple[str, float] | None:
+        """Index html under key unless it near-duplicates an existing entry; return that match."""
+        sig = self.signature(html)
+        match = self.query(sig, exclude=key)
+        if match is None:
+            self.add(key, sig)
+        return match
+
+    # ---- persistence ----
+    def save(self, path: str):
+        live = [i for i, k in enumerate(self.keys) if k is not None]
+        sigs = np.stack([self.sigs[i] for i in live]) if live else np.zeros((0, self.num_perm), np.uint32)
+        np.savez_compressed(
+            path,
+            keys=np.array([self.keys[i] for i in live], dtype=str),
+            sigs=sigs,
+            params=np.array([self.num_perm, self.bands, SHINGLE, SEED]),
+            threshold=np.array(self.threshold),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "NearDupIndex":
+        data = np.load(path)
+        num_perm, bands, shingle, seed = (int(x) for x in data["params"])
+        if (shingle, seed) != (SHINGLE, SEED):
+            raise ValueError(f"{path} was built with different shingle/seed settings")
+        index = cls(num_perm, bands, float(data["threshold"]))
+        for key, sig in zip(data["keys"], data["sigs"]):
+            index.add(str(key), sig)
+        return index
+
+# ==============================
+# DEDUPLICATION
+# ==============================
+def row_key(row: dict) -> str:
+    return row.get("url") or row.get("name") or ""
+
+def dedupe_rows(rows: list[dict], index: NearDupIndex, generate, rounds: int = DUP_REGEN_ROUNDS):
+    """
+    Check each freshly generated description against the index and regenerate
+    only the near-duplicates with generate(row) (which sees status 'duplicate'
+    and can add DUPLICATE_HINT). Rows still too similar after `rounds` keep
+    their text with status 'duplicate' + duplicate_of.
+    """
+    pending = rows
+    for round_no in range(rounds + 1):
+        dups = []
+        for r in pending:
+            if r.get("enrich_status") != STATUS_OK:
+                r["duplicate_of"] = ""
+                continue
+            with METRICS.stage("dedupe"):
+                match = index.check_and_add(row_key(r), r["description_html"])
+            r["duplicate_of"] = match[0] if match else ""
+            if match:
+                r["enrich_status"] = STATUS_DUPLICATE
+                dups.append(r)
+        if not dups or round_no == rounds:
+            break
+        METRICS.count("duplicates_regenerated", len(dups))
+        print(f"♻️ {len(dups)} near-duplicate description(s), regenerating")
+        enrich_rows(dups, generate)
+        pending = dups
+
+def load_index(csv_path: str, rows) -> NearDupIndex:
+    """
+    The index saved next to csv_path, or one rebuilt from the finished rows
+    of `rows` (any iterable of row dicts; only consumed when rebuilding).
+    """
+    path = index_path(csv_path)
+    if os.path.exists(path):
+        return NearDupIndex.load(path)
+    index = NearDupIndex()
+    for r in rows:
+        if not needs_retry(r):
+            index.add(row_key(r), index.signature(r["description_html"]))
+    return index
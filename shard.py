@@ -0,0 +1,192 @@
+import os
+import re
+import sys
+import glob
+import codecs
+import hashlib
+import argparse
+import subprocess
+import pandas as pd
+
+from metrics import METRICS, RUN_REPORT, PROMETHEUS_OUT, PROFILE_OUT, run_profiled
+from columnar import BatchWriter, arrow_path
+from enrich_retry import STATUS_OK, STATUS_DUPLICATE
+from near_dupes import NearDupIndex, index_path
+
+# ==============================
+# HELPERS
+# ==============================
+def parse_shard(value: str) -> tuple[int, int]:
+    """'2/4' -> (2, 4). Shards are numbered 0 .. N-1 (GitHub matrix style)."""
+    m = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not m:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {value!r}")
+    i, n = int(m.group(1)), int(m.group(2))
+    if n < 1 or not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"shard index must be 0 <= i < N, got {value!r}")
+    return i, n
+
+def shard_of(key: str, n: int) -> int:
+    # hashlib, not hash(): must agree across processes, machines and Python versions
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % n
+
+def in_shard(key: str, shard: tuple[int, int] | None) -> bool:
+    """
+    True if key belongs to this shard; everything does when unsharded.
+    Pass hotels_all.norm_url() output so every process hashes the same string.
+    """
+    if shard is None:
+        return True
+    i, n = shard
+    return shard_of(key, n) == i
+
+def shard_path(path: str, shard: tuple[int, int] | None) -> str:
+    """hotels_enriched.csv -> hotels_enriched.shard-0-of-4.csv"""
+    if shard is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard-{shard[0]}-of-{shard[1]}{ext}"
+
+# ==============================
+# ENTRY POINTS
+# ==============================
+def add_run_arguments(ap: argparse.ArgumentParser, default_mode: str | None = None, sharded: bool = True):
+    """
+    Flags shared by the scraper/enricher/crawler entry points. With default_mode,
+    also a positional mode: default_mode or 'retry-failed'.
+    """
+    if default_mode:
+        ap.add_argument("mode", nargs="?", default=default_mode, choices=[default_mode, "retry-failed"],
+                        help="'retry-failed' re-enriches only unsuccessful rows of the previous output")
+    ap.add_argument("--profile", action="store_true", help="run under cProfile and dump the hottest functions")
+    ap.add_argument("--prometheus", action="store_true", help=f"also write metrics to {PROMETHEUS_OUT}")
+    if sharded:
+        # Per-shard file names so shards can run side by side; merge with `python shard.py merge`
+        ap.add_argument("--shard", type=parse_shard, default=None, metavar="i/N",
+                        help="only process hotels whose URL hashes to shard i of N (0-based)")
+
+def run_with_metrics(args: argparse.Namespace, fn, *fn_args):
+    """Run fn (under cProfile with --profile) and always write the run report, per shard."""
+    shard = getattr(args, "shard", None)
+    try:
+        if args.profile:
+            return run_profiled(fn, *fn_args, out=shard_path(PROFILE_OUT, shard))
+        return fn(*fn_args)
+    finally:
+        METRICS.write(shard_path(RUN_REPORT, shard),
+                      shard_path(PROMETHEUS_OUT, shard) if args.prometheus else None)
+
+# ==============================
+# MERGE
+# ==============================
+def detect_encoding(path: str) -> str:
+    """'utf-8-sig' if the file starts with a BOM (hotels_ai_ready for Excel), else 'utf-8'."""
+    with open(path, "rb") as fh:
+        return "utf-8-sig" if fh.read(3) == codecs.BOM_UTF8 else "utf-8"
+
+def merge(out_csv: str, inputs: list[str] | None = None, encoding: str | None = None) -> int:
+    """
+    Combine shard CSVs into out_csv (+ .arrow): deduplicated on the
+    normalised url (keeping an 'ok' enrichment over a failed one) and
+    ordered by name, then url, so the result does not depend on shard timing.
+    The output keeps the shards' encoding unless `encoding` is given.
+    """
+    from hotels_all import norm_url  # late import: hotels_all imports this module
+
+    if not inputs:
+        root, ext = os.path.splitext(out_csv)
+        inputs = sorted(glob.glob(f"{root}.shard-*-of-*{ext}"))
+    if not inputs:
+        print(f"❌ No shard files found for {out_csv}")
+        return 0
+
+    encoding = encoding or detect_encoding(inputs[0])
+    counts = {int(m.group(1)) for m in (re.search(r"-of-(\d+)\.", p) for p in inputs) if m}
+    for n in counts:
+        missing = [i for i in range(n) if not any(f".shard-{i}-of-{n}." in p for p in inputs)]
+        if missing:
+            print(f"⚠️ Missing shard(s) {missing} of {n} — merged output will be incomplete")
+
+    df = pd.concat(
+        [pd.read_csv(p, dtype=str, keep_default_na=False) for p in inputs],
+        ignore_index=True,
+    )
+    key = df["url"].map(norm_url) if "url" in df.columns else df["name"]
+    df["_key"] = key.where(key != "", df["name"])
+    df["_ok"] = (df["enrich_status"] == STATUS_OK) if "enrich_status" in df.columns else True
+    df["_sort"] = df["name"].str.casefold()
+    df = (
+        df.sort_values(["_key", "_ok"], ascending=[True, False], kind="stable")
+          .drop_duplicates("_key")
+          .sort_values(["_sort", "_key"], kind="stable")
+    )
+    fields = [c for c in df.columns if not c.startswith("_")]
+    rows = df[fields].to_dict("records")
+
+    if "description_html" in fields and "enrich_status" in fields:
+        # Each shard only deduplicated its own slice; catch near-duplicates across shards
+        if "duplicate_of" not in fields:
+            fields.append("duplicate_of")
+        index = NearDupIndex()
+        flagged = 0
+        for r in rows:
+            if r["enrich_status"] != STATUS_OK:
+                continue
+            match = index.check_and_add(r.get("url") or r["name"], r["description_html"])
+            if match:
+                r["enrich_status"], r["duplicate_of"] = STATUS_DUPLICATE, match[0]
+                flagged += 1
+        index.save(index_path(out_csv))
+        if flagged:
+            print(f"♻️ {flagged} cross-shard near-duplicate(s) flagged; regenerate with retry-failed")
+
+    out = BatchWriter(out_csv, fields, encoding=encoding)
+    out.write(rows)
+    out.close()
+    print(f"✅ Merged {len(inputs)} shard files ({len(key)} rows) -> {out.rows} rows in {out_csv} + {arrow_path(out_csv)}")
+    return out.rows
+
+# ==============================
+# LOCAL LAUNCHER
+# ==============================
+def launch(n: int, script: str, extra: list[str]) -> int:
+    """Run `python <script> --shard i/n` for every i in parallel and wait for all."""
+    procs = [
+        subprocess.Popen([sys.executable, script, "--shard", f"{i}/{n}", *extra])
+        for i in range(n)
+    ]
+    codes = [p.wait() for p in procs]
+    failed = [i for i, c in enumerate(codes) if c]
+    if failed:
+        print(f"❌ Shard(s) {failed} failed")
+    else:
+        print(f"✅ All {n} shards finished")
+    return 1 if failed else 0
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    ap = argparse.ArgumentParser(description="Sharded scraping helpers.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    m = sub.add_parser("merge", help="combine shard outputs into one ordered, deduplicated CSV")
+    m.add_argument("out_csv", help="merged output, e.g. hotels_enriched.csv")
+    m.add_argument("inputs", nargs="*", help="shard CSVs (default: <out>.shard-*-of-*.csv)")
+    m.add_argument("--encoding", default=None,
+                   help="output encoding (default: same as the shards, e.g. utf-8-sig for hotels_ai_ready)")
+
+    l = sub.add_parser("launch", help="run N shards of a script as local processes")
+    l.add_argument("n", type=int)
+    l.add_argument("script", help="e.g. hotels_all.py or hotels_ai_enrich.py")
+    l.add_argument("extra", nargs=argparse.REMAINDER, help="extra arguments for the script")
+
+    args = ap.parse_args()
+    if args.cmd == "merge":
+        merge(args.out_csv, args.inputs, args.encoding)
+    else:
+        sys.exit(launch(args.n, args.script, args.extra))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import os
+import csv
+import time
+from collections import deque
+import requests
+
+from metrics import METRICS
+
+# ==============================
+# CONFIG
+# ==============================
+RATE_START = 1.0        # requests per second at startup
+RATE_FLOOR = 0.2        # never slower than one request every 5 s
+RATE_CEILING = 5.0      # never faster than this, however healthy the site looks
+RATE_INCREASE = 0.1     # additive increase (req/s) per healthy response
+RATE_DECREASE = 0.5     # multiplicative decrease on 429/503/errors/slow responses
+TARGET_LATENCY = 2.0    # seconds; slower responses count as "unhealthy"
+MAX_ERROR_RATE = 0.1    # only speed up while the recent error rate is below this
+WINDOW = 20             # number of recent responses used for the error rate
+MAX_RETRIES = 3         # retries for 429/503 (after honouring Retry-After)
+THROTTLE_LOG = "throttle_log.csv"
+
+BACKOFF_STATUSES = (429, 503)
+
+# ==============================
+# ADAPTIVE THROTTLE
+# ==============================
+class AdaptiveThrottle:
+    """
+    AIMD request-rate controller shared by every request of a run.
+
+    Each healthy, fast response adds RATE_INCREASE to the rate; a 429/503,
+    a connection error or a response slower than TARGET_LATENCY multiplies
+    it by RATE_DECREASE. A Retry-After header blocks all requests until it
+    expires. The rate always stays within [floor, ceiling], and every
+    request is logged with the rate in force to THROTTLE_LOG.
+    """
+
+    def __init__(self, rate=RATE_START, floor=RATE_FLOOR, ceiling=RATE_CEILING,
+                 increase=RATE_INCREASE, decrease=RATE_DECREASE,
+                 target_latency=TARGET_LATENCY, log_path=THROTTLE_LOG):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.rate = min(max(rate, floor), ceiling)
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.recent = deque(maxlen=WINDOW)   # True = error
+        self.last_at = 0.0
+        self.blocked_until = 0.0
+        self.log_path = log_path
+        self.log_fh = None
+        self.log = None
+
+    # ---- pacing ----
+    def wait(self):
+        delay = max(self.last_at + 1.0 / self.rate, self.blocked_until) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.last_at = time.monotonic()
+
+    def pause(self, seconds: float):
+        """Hold every request for `seconds` (Retry-After)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    # ---- feedback ----
+    def error_rate(self) -> float:
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+    def record(self, url: str, status: int, latency: float, retry_after: float | None = None):
+        error = status in BACKOFF_STATUSES or status >= 500 or status == 0
+        self.recent.append(error)
+        METRICS.observe("fetch", latency)
+        METRICS.count("requests")
+        METRICS.count_by("http_responses", "status", status or "error")
+
+        if error or latency > self.target_latency:
+            self.rate = max(self.floor, self.rate * self.decrease)
+        elif self.error_rate() < MAX_ERROR_RATE:
+            self.rate = min(self.ceiling, self.rate + self.increase)
+
+        if retry_after:
+            self.pause(retry_after)
+        self._log(url, status, latency)
+
+    def _log(self, url: str, status: int, latency: float):
+        if not self.log_path:
+            return
+        if self.log is None:
+            is_new = not os.path.exists(self.log_path)
+            self.log_fh = open(self.log_path, "a", newline="", encoding="utf-8")
+            self.log = csv.writer(self.log_fh)
+            if is_new:
+                self.log.writerow(["time", "url", "status", "latency_s", "rate_rps", "error_rate"])
+        self.log.writerow([
+            f"{time.time():.3f}", url, status, f"{latency:.3f}",
+            f"{self.rate:.3f}", f"{self.error_rate():.2f}",
+        ])
+        self.log_fh.flush()
+
+    # ---- requests ----
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Throttled requests.get(). 429/503 responses are retried up to
+        MAX_RETRIES times; the last response is returned either way.
+        Connection errors are recorded and re-raised.
+        """
+        kwargs.setdefault("timeout", 30)
+        for attempt in range(MAX_RETRIES + 1):
+            self.wait()
+            start = time.monotonic()
+            try:
+                r = requests.get(url, **kwargs)
+            except requests.RequestException:
+                self.record(url, 0, time.monotonic() - start)
+                raise
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            self.record(url, r.status_code, time.monotonic() - start, retry_after)
+            METRICS.count("bytes_fetched", len(r.content))
+            if r.status_code not in BACKOFF_STATUSES or attempt == MAX_RETRIES:
+                return r
+            print(f"   ⏳ {r.status_code} from server, backing off (rate {self.rate:.2f} req/s)")
+        return r
+
+    def close(self):
+        if self.log_fh:
+            self.log_fh.close()
+            self.log_fh = self.log = None
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After in seconds. HTTP-date values are ignored (the AIMD backoff still applies)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None